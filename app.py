@@ -4,17 +4,69 @@ Snippet Manager API
 A simple REST API for storing and sharing code snippets.
 """
 
-from flask import Flask, request, jsonify
+import sqlite3
+import time
+
+import orjson
+from flask import Flask, Response, request, jsonify, stream_with_context
+from flask.json.provider import JSONProvider
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import load_only, selectinload
+
 from config import Config
-from models import db, Snippet, Tag, get_or_create_tag
+from models import db, Snippet, Tag, get_or_create_tags, refresh_tag_counts
+
+
+class OrjsonProvider(JSONProvider):
+    """JSON provider backed by orjson, a C serializer several times faster
+    than the stdlib json module used by Flask's default provider."""
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
 
 app = Flask(__name__)
 app.config.from_object(Config)
+app.json = OrjsonProvider(app)
 
 # Initialize database
 db.init_app(app)
 
 
+@event.listens_for(Engine, 'connect')
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    """Enable WAL mode on SQLite so readers don't block behind writers."""
+    if isinstance(dbapi_connection, sqlite3.Connection):
+        cursor = dbapi_connection.cursor()
+        cursor.execute('PRAGMA journal_mode=WAL')
+        cursor.execute('PRAGMA synchronous=NORMAL')
+        cursor.close()
+
+# Cached /api/languages result; the distinct-language list only changes on
+# snippet writes, so serve it from memory between invalidations.
+_languages_cache = {'value': None, 'ts': 0.0}
+_LANGUAGES_CACHE_TTL = 60  # seconds
+
+
+def _invalidate_languages_cache():
+    """Drop the cached language list after a snippet write."""
+    _languages_cache['value'] = None
+
+
+def _conditional(response):
+    """Tag a response with a content ETag and honor If-None-Match.
+
+    Clients that already hold the current body get an empty 304 instead
+    of a re-transfer.
+    """
+    response.add_etag()
+    return response.make_conditional(request)
+
+
 # ---------------------------------------------------------------------------
 # Health Check
 # ---------------------------------------------------------------------------
@@ -51,29 +103,73 @@ def list_snippets():
     Query parameters:
     - language: Filter by programming language
     - tag: Filter by tag name
+    - page: Page number, starting at 1 (default: 1)
+    - per_page: Results per page (default: 20, max: 100)
+    - fields: Comma-separated subset of fields to return, e.g. fields=id,title
     """
+    try:
+        page = max(1, int(request.args.get('page', 1)))
+        per_page = int(request.args.get('per_page', Config.DEFAULT_PAGE_SIZE))
+    except ValueError:
+        return jsonify({'error': 'page and per_page must be integers'}), 400
+
+    per_page = max(1, min(per_page, Config.MAX_PAGE_SIZE))
+
     query = Snippet.query
 
-    # Filter by language
+    # Optional projection: only load and serialize the requested columns,
+    # so list views can skip pulling large code bodies from the database.
+    fields_arg = request.args.get('fields')
+    fields = None
+    if fields_arg:
+        fields = [f.strip() for f in fields_arg.split(',') if f.strip()]
+        unknown = [f for f in fields if f not in Snippet.PROJECTABLE_FIELDS]
+        if unknown:
+            return jsonify({'error': f'Unknown fields: {", ".join(unknown)}'}), 400
+
+        columns = [getattr(Snippet, f) for f in fields if f != 'tags']
+        if columns:
+            query = query.options(load_only(*columns))
+        if 'tags' in fields:
+            query = query.options(selectinload(Snippet.tags))
+    else:
+        # Eager-load tags in one IN(...) query instead of one per snippet
+        query = query.options(selectinload(Snippet.tags))
+
+    # Filter by language (stored lowercased, so exact match uses the index)
     language = request.args.get('language')
     if language:
-        query = query.filter(Snippet.language.ilike(language))
+        query = query.filter(Snippet.language == language.lower().strip())
 
     # Filter by tag
     tag_name = request.args.get('tag')
     if tag_name:
         query = query.join(Snippet.tags).filter(Tag.name.ilike(tag_name))
 
-    # Order by most recent first
-    snippets = query.order_by(Snippet.created_at.desc()).all()
+    # Order by most recent first, bounded to one page
+    query = (
+        query.order_by(Snippet.created_at.desc())
+        .limit(per_page)
+        .offset((page - 1) * per_page)
+    )
+
+    def generate():
+        """Stream the JSON array row by row instead of buffering it."""
+        yield '['
+        first = True
+        for snippet in query.yield_per(200):
+            prefix = '' if first else ','
+            first = False
+            yield prefix + orjson.dumps(snippet.to_dict(fields)).decode()
+        yield ']'
 
-    return jsonify([snippet.to_dict() for snippet in snippets])
+    return Response(stream_with_context(generate()), mimetype='application/json')
 
 
 @app.route('/api/snippets/<int:snippet_id>', methods=['GET'])
 def get_snippet(snippet_id):
     """Get a single snippet by ID."""
-    snippet = Snippet.query.get(snippet_id)
+    snippet = Snippet.query.options(selectinload(Snippet.tags)).get(snippet_id)
 
     if not snippet:
         return jsonify({'error': 'Snippet not found'}), 404
@@ -123,13 +219,14 @@ def create_snippet():
 
     # Handle tags
     if data.get('tags'):
-        for tag_name in data['tags']:
-            if tag_name and isinstance(tag_name, str):
-                tag = get_or_create_tag(tag_name)
-                snippet.tags.append(tag)
+        names = [name for name in data['tags'] if name and isinstance(name, str)]
+        snippet.tags.extend(get_or_create_tags(names))
 
     db.session.add(snippet)
+    db.session.flush()
+    refresh_tag_counts(tag.id for tag in snippet.tags)
     db.session.commit()
+    _invalidate_languages_cache()
 
     return jsonify(snippet.to_dict()), 201
 
@@ -170,13 +267,17 @@ def update_snippet(snippet_id):
 
     # Update tags if provided
     if 'tags' in data:
+        affected_tag_ids = {tag.id for tag in snippet.tags}
         snippet.tags.clear()
-        for tag_name in data['tags']:
-            if tag_name and isinstance(tag_name, str):
-                tag = get_or_create_tag(tag_name)
-                snippet.tags.append(tag)
+        names = [name for name in data['tags'] if name and isinstance(name, str)]
+        snippet.tags.extend(get_or_create_tags(names))
+        db.session.flush()
+        affected_tag_ids.update(tag.id for tag in snippet.tags)
+        refresh_tag_counts(affected_tag_ids)
 
     db.session.commit()
+    if 'language' in data:
+        _invalidate_languages_cache()
 
     return jsonify(snippet.to_dict())
 
@@ -189,8 +290,12 @@ def delete_snippet(snippet_id):
     if not snippet:
         return jsonify({'error': 'Snippet not found'}), 404
 
+    affected_tag_ids = [tag.id for tag in snippet.tags]
     db.session.delete(snippet)
+    db.session.flush()
+    refresh_tag_counts(affected_tag_ids)
     db.session.commit()
+    _invalidate_languages_cache()
 
     return jsonify({'message': 'Snippet deleted successfully'})
 
@@ -202,15 +307,27 @@ def delete_snippet(snippet_id):
 @app.route('/api/languages', methods=['GET'])
 def list_languages():
     """Get list of all languages used in snippets."""
+    now = time.monotonic()
+    if (
+        _languages_cache['value'] is not None
+        and now - _languages_cache['ts'] < _LANGUAGES_CACHE_TTL
+    ):
+        return _conditional(jsonify(_languages_cache['value']))
+
     languages = db.session.query(Snippet.language).distinct().order_by(Snippet.language).all()
-    return jsonify([lang[0] for lang in languages])
+    result = [lang[0] for lang in languages]
+    _languages_cache['value'] = result
+    _languages_cache['ts'] = now
+    return _conditional(jsonify(result))
 
 
 @app.route('/api/tags', methods=['GET'])
 def list_tags():
     """Get list of all tags with snippet counts."""
+    # snippet_count is maintained on the snippet write paths, so this is
+    # a single plain SELECT with no aggregation.
     tags = Tag.query.all()
-    return jsonify([tag.to_dict() for tag in tags])
+    return _conditional(jsonify([tag.to_dict() for tag in tags]))
 
 
 # ---------------------------------------------------------------------------
@@ -227,6 +344,11 @@ def not_found(error):
     return jsonify({'error': 'Not found'}), 404
 
 
+@app.errorhandler(413)
+def payload_too_large(error):
+    return jsonify({'error': 'Request body too large'}), 413
+
+
 @app.errorhandler(500)
 def internal_error(error):
     db.session.rollback()
@@ -13,6 +13,18 @@ class Config:
     )
     SQLALCHEMY_TRACK_MODIFICATIONS = False
 
+    # Explicit connection pool settings for server databases; SQLite uses
+    # its own pooling and rejects these arguments. Tunable per deployment
+    # (and per CI worker) via the environment.
+    if not SQLALCHEMY_DATABASE_URI.startswith('sqlite'):
+        SQLALCHEMY_ENGINE_OPTIONS = {
+            'pool_size': int(os.getenv('POOL_SIZE', '20')),
+            'max_overflow': int(os.getenv('POOL_MAX_OVERFLOW', '10')),
+            'pool_timeout': int(os.getenv('POOL_TIMEOUT', '30')),
+            'pool_recycle': int(os.getenv('POOL_RECYCLE', '1800')),
+            'pool_pre_ping': True,
+        }
+
     # Flask
     SECRET_KEY = os.getenv('SECRET_KEY', 'dev-secret-key-change-in-production')
     DEBUG = os.getenv('FLASK_DEBUG', '1') == '1'
@@ -21,3 +33,7 @@ class Config:
     MAX_SNIPPET_SIZE = 50000  # Maximum code length in characters
     DEFAULT_PAGE_SIZE = 20
     MAX_PAGE_SIZE = 100
+
+    # Reject oversize request bodies before they are buffered and parsed.
+    # Worst-case JSON escaping doubles the code payload, plus metadata room.
+    MAX_CONTENT_LENGTH = MAX_SNIPPET_SIZE * 2 + 4096
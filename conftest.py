@@ -0,0 +1,138 @@
+"""
+Shared pytest fixtures.
+
+The database is built and seeded once per session; individual tests are
+isolated by wrapping each one in an outer transaction that rolls back at
+teardown (commits inside request handlers become SAVEPOINTs).
+"""
+
+import logging
+import os
+
+# Flask-SQLAlchemy creates its engines eagerly in init_app, which runs when
+# the app module is imported — so the test database must be chosen *before*
+# that import, not inside a fixture. A named shared-cache URI keeps the
+# database in RAM while letting every connection in the process see the same
+# data, and the pytest-xdist worker id in the name gives each parallel
+# worker its own isolated database.
+_worker = os.environ.get('PYTEST_XDIST_WORKER', 'gw0')
+os.environ['DATABASE_URL'] = (
+    f'sqlite:///file:snippet_test_{_worker}?mode=memory&cache=shared&uri=true'
+)
+
+import pytest
+from sqlalchemy.orm import configure_mappers, scoped_session, sessionmaker
+
+from app import app, db, _invalidate_languages_cache
+from models import Snippet, Tag, refresh_tag_counts, snippet_tags
+
+# Keep werkzeug's per-request log lines out of the test output
+logging.getLogger('werkzeug').setLevel(logging.ERROR)
+
+
+@pytest.fixture(scope='session')
+def database():
+    """Create the schema and seed data once for the whole test session."""
+    # Engine-level settings (echo, query recording, modification tracking)
+    # can't be changed here — the engine already exists by the time fixtures
+    # run — but they all default to off, so there's nothing to override.
+    app.config['TESTING'] = True
+
+    ctx = app.app_context()
+    ctx.push()
+    db.create_all()
+    _seed_test_data()
+
+    yield db
+
+    db.session.remove()
+    db.drop_all()
+    ctx.pop()
+
+
+@pytest.fixture(scope='session', autouse=True)
+def prewarm(database):
+    """Pay one-time mapper/compile/import costs before the first test.
+
+    Finalizing mappers, compiling the first ORM SELECT, and spinning up the
+    first request context all happen here instead of inflating whichever
+    test happens to run first.
+    """
+    configure_mappers()
+    db.session.execute(db.select(Snippet).limit(1)).all()
+    app.test_client().get('/health')
+
+
+@pytest.fixture(scope='session')
+def test_client(database):
+    """One shared Werkzeug test client for the whole session.
+
+    Construction is cheap but not free, and nothing in these tests
+    mutates the client itself (auth and state live in the database).
+    """
+    with app.test_client() as shared_client:
+        yield shared_client
+
+
+@pytest.fixture(scope='class')
+def client_ro(test_client):
+    """Shared client for read-only tests: no transaction wrap, no rollback.
+
+    Tests that never mutate state don't need the savepoint machinery; they
+    read the seeded session database directly. Any test that writes must
+    use `client` instead.
+    """
+    _invalidate_languages_cache()
+    return test_client
+
+
+@pytest.fixture
+def client(test_client):
+    """Test client whose database work rolls back after each test.
+
+    Instead of dropping and recreating the schema per test, the session is
+    rebound to a connection holding an open outer transaction. Commits
+    inside request handlers become SAVEPOINTs, and rolling the outer
+    transaction back at teardown restores the seeded state.
+    """
+    _invalidate_languages_cache()
+
+    connection = db.engine.connect()
+    transaction = connection.begin()
+    original_session = db.session
+    db.session = scoped_session(
+        sessionmaker(bind=connection, join_transaction_mode='create_savepoint')
+    )
+
+    yield test_client
+
+    db.session.remove()
+    db.session = original_session
+    transaction.rollback()
+    connection.close()
+
+
+def _seed_test_data():
+    """Add minimal test data with three Core statements (no ORM flushes)."""
+    tag_rows = db.session.execute(
+        Tag.__table__.insert().returning(Tag.__table__.c.id, Tag.__table__.c.name),
+        [{'name': 'python'}, {'name': 'utility'}],
+    ).all()
+    tag_ids = {name: tag_id for tag_id, name in tag_rows}
+
+    snippet_id = db.session.execute(
+        Snippet.__table__.insert().returning(Snippet.__table__.c.id),
+        [{
+            'title': 'Hello World',
+            'code': 'print("Hello, World!")',
+            'language': 'python',
+            'description': 'A simple greeting',
+        }],
+    ).scalar()
+
+    db.session.execute(
+        snippet_tags.insert(),
+        [{'snippet_id': snippet_id, 'tag_id': tag_ids['python']}],
+    )
+    refresh_tag_counts(tag_ids.values())
+    db.session.commit()
@@ -1,9 +1,22 @@
 from datetime import datetime
+from functools import lru_cache
+
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy.dialects import postgresql, sqlite
 
 db = SQLAlchemy()
 
 
+@lru_cache(maxsize=4096)
+def _iso_utc(dt):
+    """Format a UTC datetime as ISO-8601 with a Z suffix, memoized.
+
+    Unchanged rows serialize the same timestamps on every request; caching
+    the formatted string avoids redoing the isoformat work per row.
+    """
+    return dt.isoformat() + 'Z'
+
+
 # Association table for snippet tags (many-to-many)
 snippet_tags = db.Table(
     'snippet_tags',
@@ -16,6 +29,11 @@ class Snippet(db.Model):
     """A code snippet with metadata."""
 
     __tablename__ = 'snippets'
+    __table_args__ = (
+        # list_snippets filters by language and orders by created_at
+        db.Index('ix_snippet_lang_created', 'language', 'created_at'),
+        db.Index('ix_snippet_created', 'created_at'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String(200), nullable=False)
@@ -25,21 +43,37 @@ class Snippet(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
-    # Relationships
-    tags = db.relationship('Tag', secondary=snippet_tags, backref=db.backref('snippets', lazy='dynamic'))
-
-    def to_dict(self):
-        """Convert snippet to dictionary for JSON serialization."""
-        return {
-            'id': self.id,
-            'title': self.title,
-            'code': self.code,
-            'language': self.language,
-            'description': self.description,
-            'tags': [tag.name for tag in self.tags],
-            'created_at': self.created_at.isoformat() + 'Z' if self.created_at else None,
-            'updated_at': self.updated_at.isoformat() + 'Z' if self.updated_at else None,
-        }
+    # Relationships. There is no reverse side: nothing navigates from a tag
+    # to its snippets, and the denormalized Tag.snippet_count covers the old
+    # tag.snippets.count() use.
+    tags = db.relationship('Tag', secondary=snippet_tags)
+
+    #: Field names clients may request via the ?fields= projection.
+    PROJECTABLE_FIELDS = (
+        'id', 'title', 'code', 'language', 'description',
+        'tags', 'created_at', 'updated_at',
+    )
+
+    def to_dict(self, fields=None):
+        """Convert snippet to dictionary for JSON serialization.
+
+        When fields is given, only those keys are built — important when
+        the query only loaded a subset of columns, since touching the
+        others would trigger extra lazy loads.
+        """
+        if fields is None:
+            fields = self.PROJECTABLE_FIELDS
+
+        data = {}
+        for field in fields:
+            if field == 'tags':
+                data['tags'] = [tag.name for tag in self.tags]
+            elif field in ('created_at', 'updated_at'):
+                value = getattr(self, field)
+                data[field] = _iso_utc(value) if value else None
+            else:
+                data[field] = getattr(self, field)
+        return data
 
     def __repr__(self):
         return f'<Snippet {self.id}: {self.title}>'
@@ -52,13 +86,16 @@ class Tag(db.Model):
 
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(50), unique=True, nullable=False)
+    # Denormalized count maintained by the snippet write paths, so reads
+    # never have to aggregate over the association table.
+    snippet_count = db.Column(db.Integer, default=0, nullable=False)
 
     def to_dict(self):
         """Convert tag to dictionary for JSON serialization."""
         return {
             'id': self.id,
             'name': self.name,
-            'snippet_count': self.snippets.count()
+            'snippet_count': self.snippet_count
         }
 
     def __repr__(self):
@@ -72,3 +109,53 @@ def get_or_create_tag(name):
         tag = Tag(name=name.lower().strip())
         db.session.add(tag)
     return tag
+
+
+def get_or_create_tags(names):
+    """
+    Get or create several tags with a single lookup.
+
+    Inserts any missing names with a single INSERT ... ON CONFLICT DO
+    NOTHING, so concurrent writers can never race each other into a unique
+    constraint violation, then fetches all rows with one IN (...) query.
+    Returns Tag objects in the order the names were given (duplicates
+    collapsed).
+    """
+    normalized = []
+    for name in names:
+        name = name.lower().strip()
+        if name and name not in normalized:
+            normalized.append(name)
+
+    if not normalized:
+        return []
+
+    if db.engine.dialect.name == 'postgresql':
+        dialect_insert = postgresql.insert
+    else:
+        dialect_insert = sqlite.insert
+    stmt = (
+        dialect_insert(Tag.__table__)
+        .values([{'name': name} for name in normalized])
+        .on_conflict_do_nothing(index_elements=['name'])
+    )
+    db.session.execute(stmt)
+
+    tags = {tag.name: tag for tag in Tag.query.filter(Tag.name.in_(normalized)).all()}
+    return [tags[name] for name in normalized]
+
+
+def refresh_tag_counts(tag_ids):
+    """Recompute the denormalized snippet_count for the given tags."""
+    tag_ids = list(tag_ids)
+    if not tag_ids:
+        return
+
+    count_subquery = (
+        db.session.query(db.func.count(snippet_tags.c.snippet_id))
+        .filter(snippet_tags.c.tag_id == Tag.id)
+        .scalar_subquery()
+    )
+    db.session.query(Tag).filter(Tag.id.in_(tag_ids)).update(
+        {Tag.snippet_count: count_subquery}, synchronize_session=False
+    )